@@ -0,0 +1,85 @@
+from __future__ import print_function, division
+
+import numpy as np
+
+# Numba is an optional dependency - if it is not installed, ConvolvedFluxes
+# falls back to the pure Numpy implementations.
+try:
+    from numba import njit, prange
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+else:
+    HAS_NUMBA = True
+
+__all__ = ['HAS_NUMBA', 'radius_sigma_kernel']
+
+
+def _sigma(flux, areas, im, ia):
+    """
+    The mean surface brightness of model ``im`` in the annulus ending at
+    aperture ``ia``, given the areas of the annuli.
+    """
+    if ia == 0:
+        return flux[im, 0] / areas[0]
+    else:
+        return (flux[im, ia] - flux[im, ia - 1]) / areas[ia]
+
+
+def _radius_sigma(flux, apertures, fraction, radius):
+    """
+    Find for each model the outermost radius where the surface brightness is
+    larger than ``fraction`` times the peak surface brightness.
+
+    ``flux`` should be a 2-d array of cumulative fluxes with dimensions
+    (n_models, n_ap), ``apertures`` a 1-d array of apertures, and the result
+    is written to the 1-d ``radius`` array.
+    """
+
+    n_models, n_ap = flux.shape
+
+    # The areas of the annuli (up to a factor of pi) are the same for all
+    # models, so we compute them once here rather than inside the loop.
+    areas = np.empty(n_ap)
+    areas[0] = apertures[0] ** 2
+    for ia in range(1, n_ap):
+        areas[ia] = apertures[ia] ** 2 - apertures[ia - 1] ** 2
+
+    for im in prange(n_models):
+
+        # Find the peak surface brightness - as for np.max, any NaN value
+        # (e.g. from repeated apertures) should propagate to the result
+        maximum = _sigma(flux, areas, im, 0)
+        for ia in range(1, n_ap):
+            sigma = _sigma(flux, areas, im, ia)
+            if sigma > maximum or sigma != sigma:
+                maximum = sigma
+
+        threshold = fraction * maximum
+
+        sigma_next = _sigma(flux, areas, im, n_ap - 1)
+
+        if sigma_next > threshold:
+            radius[im] = apertures[n_ap - 1]
+            continue
+
+        # Linear interpolation - walk backwards and stop at the first
+        # aperture where the surface brightness is above the threshold
+        r = 0.
+        for ia in range(n_ap - 2, -1, -1):
+            sigma = _sigma(flux, areas, im, ia)
+            if sigma > threshold:
+                r = (sigma - threshold) / (sigma - sigma_next) * \
+                    (apertures[ia + 1] - apertures[ia]) + apertures[ia]
+                if r != 0.:
+                    break
+            sigma_next = sigma
+
+        radius[im] = r
+
+
+if HAS_NUMBA:
+    _sigma = njit(cache=True)(_sigma)
+    radius_sigma_kernel = njit(parallel=True, cache=True)(_radius_sigma)
+else:
+    radius_sigma_kernel = None
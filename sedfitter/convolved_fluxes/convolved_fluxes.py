@@ -1,22 +1,31 @@
 from __future__ import print_function, division
 
+import functools
+
 import numpy as np
 np.seterr(all='ignore')
 
-from scipy.interpolate import interp1d
-
 from astropy.logger import log
 from astropy import units as u
 from astropy.io import fits
-from astropy.table import Table
 
 from ..utils.validator import validate_scalar, validate_array
 from ..utils.io import read_table
 
-# TODO: get rid of use of interp1d
+from ._kernels import HAS_NUMBA, radius_sigma_kernel
+
+# fitsio is an optional dependency that is faster than astropy.io.fits for
+# reading in the binary tables of convolved fluxes.
+try:
+    import fitsio
+except ImportError:
+    fitsio = None
 
 __all__ = ['ConvolvedFluxes', 'MonochromaticFluxes']
 
+# Number of models to process at a time when computing radii
+_RADIUS_BLOCK = 4096
+
 
 def is_numpy_array(variable):
     return issubclass(variable.__class__, (np.ndarray,
@@ -24,12 +33,203 @@ def is_numpy_array(variable):
                                            np.ma.core.MaskedArray))
 
 
+def _same_array(a, b):
+    """
+    Check whether two arrays are views of exactly the same data
+    """
+    if a is b:
+        return True
+    elif a is None or b is None:
+        return False
+    else:
+        return a.dtype == b.dtype and a.shape == b.shape and a.strides == b.strides and \
+            a.__array_interface__['data'][0] == b.__array_interface__['data'][0]
+
+
+def _column_unit(unit, default=u.mJy):
+    """
+    Parse the unit of a FITS table column, using ``default`` if not present
+    """
+    if unit is None or unit == '':
+        return default
+    else:
+        return u.Unit(unit, format='fits')
+
+
+def _as_native(array):
+    """
+    Return a C-contiguous version of an array in native byte order
+
+    FITS files are big-endian, and operations on non-native arrays are much
+    slower, so arrays read in from files should be converted once here.
+    """
+    array = np.asarray(array)
+    if not array.dtype.isnative:
+        array = array.astype(array.dtype.newbyteorder('='))
+    return np.ascontiguousarray(array)
+
+
+def _read_astropy(filename):
+    """
+    Read the contents of a convolved flux FITS file using astropy.io.fits
+    """
+
+    # Open the convolved flux FITS file. The file is memory-mapped and the
+    # columns are read directly from the HDU rather than going through
+    # Table, which would make an additional copy of the fluxes. All the
+    # columns are copied out of the file (by _as_native since FITS data is
+    # big-endian) so the file can be closed once read.
+    with fits.open(filename, memmap=True) as convolved:
+
+        keywords = convolved[0].header
+
+        # Try and read in the wavelength of the filter
+        if 'FILTWAV' in keywords:
+            wavelength = keywords['FILTWAV'] * u.micron
+        else:
+            wavelength = None
+
+        # Read in apertures, if present
+        try:
+            ta = read_table(convolved['APERTURES'])
+        except KeyError:
+            apertures = None
+        else:
+            if ta['APERTURE'].unit is None:
+                ta['APERTURE'].unit = u.au
+            apertures = u.Quantity(_as_native(ta['APERTURE'].data), ta['APERTURE'].unit, copy=False)
+
+        # Create shortcuts to table
+        hdu = convolved['CONVOLVED FLUXES']
+
+        # Read in model names
+        model_names = np.array(hdu.data['MODEL_NAME'])
+
+        # Read in flux and flux errors
+        flux = u.Quantity(_as_native(hdu.data['TOTAL_FLUX']),
+                          _column_unit(hdu.columns['TOTAL_FLUX'].unit), copy=False)
+        error = u.Quantity(_as_native(hdu.data['TOTAL_FLUX_ERR']),
+                           _column_unit(hdu.columns['TOTAL_FLUX_ERR'].unit), copy=False)
+
+    return wavelength, apertures, model_names, flux, error
+
+
+def _read_fitsio(filename):
+    """
+    Read the contents of a convolved flux FITS file using fitsio
+    """
+
+    def read_column(hdu, name, default_unit):
+        column = hdu.get_colnames().index(name) + 1
+        unit = _column_unit(hdu.read_header().get('TUNIT{0}'.format(column)), default=default_unit)
+        return u.Quantity(_as_native(hdu.read_column(name)), unit, copy=False)
+
+    with fitsio.FITS(filename) as convolved:
+
+        keywords = convolved[0].read_header()
+
+        # Try and read in the wavelength of the filter
+        if 'FILTWAV' in keywords:
+            wavelength = keywords['FILTWAV'] * u.micron
+        else:
+            wavelength = None
+
+        # Read in apertures, if present
+        if 'APERTURES' in convolved:
+            apertures = read_column(convolved['APERTURES'], 'APERTURE', u.au)
+        else:
+            apertures = None
+
+        # Create shortcuts to table
+        hdu = convolved['CONVOLVED FLUXES']
+
+        # Read in model names
+        model_names = hdu.read_column('MODEL_NAME')
+
+        # Read in flux and flux errors
+        flux = read_column(hdu, 'TOTAL_FLUX', u.mJy)
+        error = read_column(hdu, 'TOTAL_FLUX_ERR', u.mJy)
+
+    return wavelength, apertures, model_names, flux, error
+
+
+def _radius_cumul(flux, apertures, fraction):
+    """
+    Find for each model the radius containing a fraction of the flux, given
+    the cumulative fluxes ``flux`` and the apertures ``apertures``.
+    """
+
+    required = fraction * flux[:, -1]
+
+    radius = np.zeros(flux.shape[0], dtype=np.result_type(flux, apertures))
+
+    if flux.shape[1] > 1:
+
+        # Find the apertures that bracket the required flux. For the usual
+        # case of a monotonically increasing cumulative flux there is at most
+        # one such interval, but to handle NaN values and non-monotonic fluxes
+        # we use the outermost interval, and leave the radius set to zero if
+        # there is none.
+        bracket = (required[:, np.newaxis] >= flux[:, :-1]) & \
+                  (required[:, np.newaxis] < flux[:, 1:])
+        found = bracket.any(axis=1)
+        lower = flux.shape[1] - 2 - np.argmax(bracket[:, ::-1], axis=1)
+        upper = lower + 1
+
+        flux_lower = np.take_along_axis(flux, lower[:, np.newaxis], axis=1)[:, 0]
+        flux_upper = np.take_along_axis(flux, upper[:, np.newaxis], axis=1)[:, 0]
+
+        estimate = (required - flux_lower) / (flux_upper - flux_lower) * \
+                   (apertures[upper] - apertures[lower]) + apertures[lower]
+
+        radius = np.where(found, estimate, radius)
+
+    radius = np.where(required < flux[:, 0], apertures[0], radius)
+    radius = np.where(required >= flux[:, -1], apertures[-1], radius)
+
+    return radius
+
+
+def _cached_radius(method):
+    """
+    Cache the radii returned by ``method`` for each value of the fraction.
+
+    The cache is stored in the ``_radius_cache`` attribute and is reset when
+    new fluxes or apertures are set.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, fraction):
+        cache = self._radius_cache.setdefault(method.__name__, {})
+        if fraction not in cache:
+            cache[fraction] = method(self, fraction)
+        return cache[fraction].copy()
+
+    return wrapper
+
+
+def _surface_brightness(flux, apertures, ia):
+    """
+    Find the mean surface brightness in the annulus ending at aperture ``ia``
+    given the cumulative fluxes ``flux`` for all models.
+    """
+    if ia == 0:
+        return flux[:, 0] / apertures[0] ** 2
+    else:
+        return (flux[:, ia] - flux[:, ia - 1]) / \
+               (apertures[ia] ** 2 - apertures[ia - 1] ** 2)
+
+
 class ConvolvedFluxes(object):
 
     def __init__(self, wavelength=None, model_names=None, apertures=None,
                  flux=None, error=None,
                  initialize_arrays=False, initialize_units=u.mJy):
 
+        # The type to use for interpolation, if reduced precision was
+        # requested when reading in the fluxes
+        self._dtype = None
+
         self.model_names = model_names
         self.apertures = apertures
         self.central_wavelength = wavelength
@@ -79,8 +279,10 @@ class ConvolvedFluxes(object):
     def model_names(self, value):
         if value is None:
             self._model_names = value
+            self._n_models = None
         else:
             self._model_names = validate_array('model_names', value, ndim=1)
+            self._n_models = self._model_names.shape[0]
 
     @property
     def apertures(self):
@@ -93,69 +295,102 @@ class ConvolvedFluxes(object):
     def apertures(self, value):
         if value is None:
             self._apertures = None
+            self._n_ap = 1
         else:
             self._apertures = validate_array('apertures', value, domain='positive', ndim=1, physical_type='length')
+            self._n_ap = len(self._apertures)
+
+        self._radius_cache = {}
 
     @property
     def flux(self):
         """
         The SED fluxes
         """
-        return self._flux
+        if self._flux_value is None:
+            return None
+        else:
+            return u.Quantity(self._flux_value, self._flux_unit, copy=False)
 
     @flux.setter
     def flux(self, value):
         if value is None:
-            self._flux = value
+            self._flux_value = None
+            self._flux_unit = None
         else:
 
             if self.model_names is None:
                 raise ValueError("model_names has not been set")
 
-            self._flux = validate_array('flux', value, ndim=2,
-                                        shape=(self.n_models, self.n_ap),
-                                        physical_type=('power', 'flux', 'spectral flux density'))
+            value = validate_array('flux', value, ndim=2,
+                                   shape=(self.n_models, self.n_ap),
+                                   physical_type=('power', 'flux', 'spectral flux density'))
+
+            self._flux_value = value.value
+            self._flux_unit = value.unit
+
+        self._radius_cache = {}
 
     @property
     def error(self):
         """
         The convolved flux errors
         """
-        return self._error
+        if self._error_value is None:
+            return None
+        else:
+            return u.Quantity(self._error_value, self._error_unit, copy=False)
 
     @error.setter
     def error(self, value):
         if value is None:
-            self._error = value
+            self._error_value = None
+            self._error_unit = None
         else:
 
             if self.model_names is None:
                 raise ValueError("model_names has not been set")
 
-            self._error = validate_array('error', value, ndim=2,
-                                         shape=(self.n_models, self.n_ap),
-                                         physical_type=('power', 'flux', 'spectral flux density'))
+            value = validate_array('error', value, ndim=2,
+                                   shape=(self.n_models, self.n_ap),
+                                   physical_type=('power', 'flux', 'spectral flux density'))
+
+            self._error_value = value.value
+            self._error_unit = value.unit
 
     @property
     def n_models(self):
-        if self.model_names is None:
-            return None
-        else:
-            return self.model_names.shape[0]
+        return self._n_models
 
     @property
     def n_ap(self):
-        if self.apertures is None:
-            return 1
-        else:
-            return len(self.apertures)
+        return self._n_ap
 
     def __eq__(self, other):
-        return self.central_wavelength == other.central_wavelength \
-            and np.all(self.model_names == other.model_names) \
-            and np.all(self.apertures == other.apertures) \
-            and np.all(self.flux == other.flux) \
-            and np.all(self.error == other.error)
+
+        if self is other:
+            return True
+
+        if self.central_wavelength != other.central_wavelength:
+            return False
+
+        # Check the cheap cases (identical arrays, missing arrays, or
+        # mismatched shapes) before doing any element-wise comparison. For the
+        # fluxes and errors, we check the stored arrays and units, since the
+        # public properties return a new Quantity each time.
+        for attribute, value, unit in (('model_names', '_model_names', None),
+                                       ('apertures', '_apertures', None),
+                                       ('flux', '_flux_value', '_flux_unit'),
+                                       ('error', '_error_value', '_error_unit')):
+            a, b = getattr(self, value), getattr(other, value)
+            if _same_array(a, b) and (unit is None or getattr(self, unit) == getattr(other, unit)):
+                continue
+            if a is None or b is None or a.shape != b.shape:
+                return False
+            if not np.all(getattr(self, attribute) == getattr(other, attribute)):
+                return False
+
+        return True
 
     def sort_to_match(self, requested_model_names):
         """
@@ -179,65 +414,81 @@ class ConvolvedFluxes(object):
         self.error = self.error[order, :]
 
     @classmethod
-    def read(cls, filename):
+    def _from_trusted_arrays(cls, wavelength, model_names, apertures,
+                             flux, flux_unit, error, error_unit):
         """
-        Read convolved flux from a FITS file
+        Create convolved fluxes from arrays that are already known to be
+        valid, without going through the validation in the setters.
 
-        Parameters
-        ----------
-        filename : str
-            The name of the FITS file to read the convolved fluxes from
+        ``wavelength`` and ``apertures`` should be Quantity objects (or
+        `None`), ``model_names`` a 1-d array, and ``flux`` and ``error``
+        plain arrays with dimensions (n_models, n_ap).
         """
 
-        conv = cls()
+        conv = cls.__new__(cls)
 
-        # Open the convolved flux FITS file
-        convolved = fits.open(filename)
+        conv._wavelength = wavelength
 
-        keywords = convolved[0].header
+        conv._model_names = model_names
+        conv._n_models = model_names.shape[0]
 
-        # Try and read in the wavelength of the filter
-        if 'FILTWAV' in keywords:
-            conv.central_wavelength = keywords['FILTWAV'] * u.micron
-        else:
-            conv.central_wavelength = None
+        conv._apertures = apertures
+        conv._n_ap = 1 if apertures is None else len(apertures)
 
-        # Read in apertures, if present
-        try:
-            ta = read_table(convolved['APERTURES'])
-            if ta['APERTURE'].unit is None:
-                ta['APERTURE'].unit = u.au
-            conv.apertures = ta['APERTURE'].data * ta['APERTURE'].unit
-        except KeyError:
-            pass
+        conv._flux_value = flux
+        conv._flux_unit = flux_unit
 
-        # Create shortcuts to table
-        tc = read_table(convolved['CONVOLVED FLUXES'])
+        conv._error_value = error
+        conv._error_unit = error_unit
 
-        # Read in model names
-        conv.model_names = tc['MODEL_NAME']
+        conv._radius_cache = {}
 
-        # Read in flux and flux errors
+        conv._dtype = None
 
-        if tc['TOTAL_FLUX'].unit is None:
-            tc['TOTAL_FLUX'].unit = u.mJy
+        return conv
 
-        if tc['TOTAL_FLUX_ERR'].unit is None:
-            tc['TOTAL_FLUX_ERR'].unit = u.mJy
+    @classmethod
+    def read(cls, filename, dtype=None):
+        """
+        Read convolved flux from a FITS file
 
-        if tc['TOTAL_FLUX'].ndim == 1 and conv.n_ap == 1:
-            conv.flux = tc['TOTAL_FLUX'].data.reshape(tc['TOTAL_FLUX'].shape[0], 1) * tc['TOTAL_FLUX'].unit
-        else:
-            conv.flux = tc['TOTAL_FLUX'].data * tc['TOTAL_FLUX'].unit
+        Parameters
+        ----------
+        filename : str
+            The name of the FITS file to read the convolved fluxes from
+        dtype : data-type, optional
+            If specified, the fluxes and errors are converted to this type
+            when read in. Using ``np.float32`` halves the memory needed for
+            the fluxes and speeds up the interpolation to new apertures, at
+            the cost of precision. By default, the type in the file is used.
+        """
 
-        if tc['TOTAL_FLUX_ERR'].ndim == 1 and conv.n_ap == 1:
-            conv.error = tc['TOTAL_FLUX_ERR'].data.reshape(tc['TOTAL_FLUX_ERR'].shape[0], 1) * tc['TOTAL_FLUX_ERR'].unit
+        if fitsio is None:
+            wavelength, apertures, model_names, flux, error = _read_astropy(filename)
         else:
-            conv.error = tc['TOTAL_FLUX_ERR'].data * tc['TOTAL_FLUX_ERR'].unit
+            wavelength, apertures, model_names, flux, error = _read_fitsio(filename)
+
+        # Files with a single aperture may store the fluxes as 1-d columns
+        if flux.ndim == 1:
+            flux = flux[:, np.newaxis]
+
+        if error.ndim == 1:
+            error = error[:, np.newaxis]
+
+        if dtype is not None:
+            flux = flux.astype(dtype, copy=False)
+            error = error.astype(dtype, copy=False)
+
+        conv = cls._from_trusted_arrays(wavelength, model_names, apertures,
+                                        flux.value, flux.unit,
+                                        error.value, error.unit)
+
+        if dtype is not None:
+            conv._dtype = np.dtype(dtype)
 
         return conv
 
-    def write(self, filename, overwrite=False):
+    def write(self, filename, overwrite=False, compute_radii=False):
         """
         Write convolved flux to a FITS file.
 
@@ -247,16 +498,24 @@ class ConvolvedFluxes(object):
             The name of the file to output the convolved fluxes to.
         overwrite: bool, optional
             Whether to overwrite the output file
+        compute_radii: bool, optional
+            Whether to compute and include the ``RADIUS_SIGMA_50`` and
+            ``RADIUS_CUMUL_99`` columns. These are only computed if apertures
+            are defined, and are not needed when reading the fluxes back in.
         """
 
-        tc = Table()
-        tc['MODEL_NAME'] = self.model_names.astype('S30')
-        tc['TOTAL_FLUX'] = self.flux
-        tc['TOTAL_FLUX_ERR'] = self.error
+        # Build the record array for the table directly from the columns to
+        # avoid making intermediate copies of the fluxes.
+        names = ['MODEL_NAME', 'TOTAL_FLUX', 'TOTAL_FLUX_ERR']
+        columns = [self.model_names.astype('S30'), self._flux_value, self._error_value]
 
-        if self.apertures is not None:
-            ta = Table()
-            ta['APERTURE'] = self.apertures
+        if compute_radii and self.apertures is not None:
+            names += ['RADIUS_SIGMA_50', 'RADIUS_CUMUL_99']
+            columns += [self.find_radius_sigma(0.50).to(u.au).value,
+                        self.find_radius_cumul(0.99).to(u.au).value]
+
+        dtype = [(name, column.dtype, column.shape[1:]) for name, column in zip(names, columns)]
+        tc = np.rec.fromarrays(columns, dtype=dtype)
 
         # Primary HDU (for metadata)
         hdu0 = fits.PrimaryHDU()
@@ -266,13 +525,17 @@ class ConvolvedFluxes(object):
         hdu0.header['NAP'] = self.n_ap
 
         # Convolved fluxes
-        hdu1 = fits.BinTableHDU(np.array(tc), name='CONVOLVED FLUXES')
-        hdu1.columns[1].unit = self.flux.unit.to_string(format='fits')
-        hdu1.columns[2].unit = self.error.unit.to_string(format='fits')
+        hdu1 = fits.BinTableHDU(tc, name='CONVOLVED FLUXES')
+        hdu1.columns[1].unit = self._flux_unit.to_string(format='fits')
+        hdu1.columns[2].unit = self._error_unit.to_string(format='fits')
+        if 'RADIUS_SIGMA_50' in names:
+            hdu1.columns[3].unit = 'AU'
+            hdu1.columns[4].unit = 'AU'
 
         # Apertures
         if self.apertures is not None:
-            hdu2 = fits.BinTableHDU(np.array(ta), name='APERTURES')
+            ta = np.rec.fromarrays([self.apertures.value], names=['APERTURE'])
+            hdu2 = fits.BinTableHDU(ta, name='APERTURES')
             hdu2.columns[0].unit = self.apertures.unit.to_string(format='fits')
         else:
             hdu2 = None
@@ -290,52 +553,72 @@ class ConvolvedFluxes(object):
             The apertures to interpolate to
         """
 
-        # Initalize new ConvolvedFluxes object to return
-        c = ConvolvedFluxes()
+        # Check the requested apertures, since they are not validated when
+        # creating the new ConvolvedFluxes object below
+        apertures = validate_array('apertures', apertures, domain='positive', ndim=1, physical_type='length')
 
-        # Set wavelength
-        c.central_wavelength = self.central_wavelength
+        # Interpolate to requested apertures
+        if self.n_ap > 1:
 
-        # Save requested apertures
-        c.apertures = apertures[:]
+            # Linear interpolation is done directly on the unitless values, so
+            # we need to make sure the new apertures are in the same units as
+            # the current ones, and we need to add the flux unit back. Since
+            # the apertures are sorted, the bracketing indices and weights can
+            # be found once and used for both the fluxes and the errors.
 
-        # Transfer model names
-        c.model_names = self.model_names
+            flux, error = self._flux_value, self._error_value
 
-        # Interpolate to requested apertures
-        if self.n_ap > 1:
+            xp = self.apertures.value
+            x = apertures.to(self.apertures.unit).value
 
             # If any apertures are larger than the defined max, reset to max
-            if np.any(c.apertures > self.apertures.max()):
-                apertures[c.apertures > self.apertures.max()] = self.apertures.max()
+            too_large = x > xp[-1]
+            if np.any(too_large):
+                apertures[too_large] = xp[-1] * self.apertures.unit
+                x = np.minimum(x, xp[-1])
 
             # If any apertures are smaller than the defined min, raise error
-            if np.any(c.apertures < self.apertures.min()):
+            if np.any(x < xp[0]):
                 raise Exception("Aperture(s) requested too small")
 
-            # Note that we have to be careful here because interp1d will drop
-            # the units, so we need to make sure the new apertures are in the
-            # same units as the current ones for the interpolation, and we need
-            # to add the flux unit back.
+            i = np.searchsorted(xp, x).clip(1, len(xp) - 1)
+            w = ((x - xp[i - 1]) / (xp[i] - xp[i - 1]))[np.newaxis, :]
+
+            # If reduced precision was requested when reading the fluxes, do
+            # the interpolation in that precision rather than upcasting to the
+            # type of the apertures
+            if self._dtype is not None:
+                w = w.astype(self._dtype, copy=False)
 
-            flux_interp = interp1d(self.apertures, self.flux)
-            c.flux = flux_interp(c.apertures.to(self.apertures.unit)) * self.flux.unit
+            new_flux = flux[:, i - 1] * (1. - w) + flux[:, i] * w
 
             # The following is not strictly correct - errors from interpolation is not interpolation of errors
-            error_interp = interp1d(self.apertures, self.error)
-            c.error = error_interp(c.apertures.to(self.apertures.unit)) * self.error.unit
+            new_error = error[:, i - 1] * (1. - w) + error[:, i] * w
 
         else:
 
-            c.flux = np.repeat(self.flux, len(c.apertures)).reshape(c.n_models, len(c.apertures))
-            c.error = np.repeat(self.error, len(c.apertures)).reshape(c.n_models, len(c.apertures))
+            # The fluxes are the same in all apertures, so we can use a
+            # read-only broadcast view rather than making a copy.
+            shape = (self.n_models, len(apertures))
+            new_flux = np.broadcast_to(self._flux_value, shape)
+            new_error = np.broadcast_to(self._error_value, shape)
+
+        c = ConvolvedFluxes._from_trusted_arrays(self.central_wavelength, self.model_names,
+                                                 apertures[:], new_flux, self._flux_unit,
+                                                 new_error, self._error_unit)
+        c._dtype = self._dtype
 
         return c
 
+    @_cached_radius
     def find_radius_cumul(self, fraction):
         """
         Find for each model the radius containing a fraction of the flux.
 
+        The radii are cached for each value of ``fraction`` until the fluxes
+        or apertures are set again (modifying the fluxes in-place does not
+        reset the cache).
+
         Parameters
         ----------
         fraction: float
@@ -344,32 +627,26 @@ class ConvolvedFluxes(object):
 
         log.debug("Calculating radii containing %g%s of the flux" % (fraction * 100., '%'))
 
-        radius = np.zeros(self.n_models, dtype=self.flux.dtype) * u.au
-
         if self.apertures is None:
 
-            return radius
+            return np.zeros(self.n_models, dtype=self._flux_value.dtype) * u.au
 
         else:
 
-            required = fraction * self.flux[:, -1]
-
-            # Linear interpolation - need to loop over apertures for vectorization
-            for ia in range(len(self.apertures) - 1):
-                calc = (required >= self.flux[:, ia]) & (required < self.flux[:, ia + 1])
-                radius[calc] = (required[calc] - self.flux[calc, ia]) / \
-                               (self.flux[calc, ia + 1] - self.flux[calc, ia]) * \
-                               (self.apertures[ia + 1] - self.apertures[ia]) + \
-                    self.apertures[ia]
+            flux = self._flux_value
+            apertures = self.apertures.to(u.au).value
 
-            calc = (required < self.flux[:, 0])
-            radius[calc] = self.apertures[0]
+            radius = np.zeros(self.n_models, dtype=np.result_type(flux, apertures))
 
-            calc = (required >= self.flux[:, -1])
-            radius[calc] = self.apertures[-1]
+            # Process the models in blocks so that the temporary arrays stay
+            # small enough to remain in the CPU cache.
+            for start in range(0, self.n_models, _RADIUS_BLOCK):
+                block = slice(start, start + _RADIUS_BLOCK)
+                radius[block] = _radius_cumul(flux[block], apertures, fraction)
 
-            return radius
+            return radius * u.au
 
+    @_cached_radius
     def find_radius_sigma(self, fraction):
         """
         Find for each model a fractional surface brightness radius
@@ -377,6 +654,10 @@ class ConvolvedFluxes(object):
         This is the outermost radius where the surface brightness is larger
         than a fraction of the peak surface brightness.
 
+        The radii are cached for each value of ``fraction`` until the fluxes
+        or apertures are set again (modifying the fluxes in-place does not
+        reset the cache).
+
         Parameters
         ----------
         fraction: float
@@ -385,27 +666,49 @@ class ConvolvedFluxes(object):
 
         log.debug("Calculating %g%s peak surface brightness radii" % (fraction * 100., '%'))
 
-        sigma = np.zeros(self.flux.shape, dtype=self.flux.dtype)
-        sigma[:, 0] = self.flux[:, 0] / self.apertures[0] ** 2
-        sigma[:, 1:] = (self.flux[:, 1:] - self.flux[:, :-1]) / \
-                       (self.apertures[1:] ** 2 - self.apertures[:-1] ** 2)
-
-        maximum = np.max(sigma, axis=1)
-
-        radius = np.zeros(self.n_models, dtype=self.flux.dtype) * u.au
-
-        # Linear interpolation - need to loop over apertures backwards for vectorization
-        for ia in range(len(self.apertures) - 2, -1, -1):
-            calc = (sigma[:, ia] > fraction * maximum) & (radius == 0.)
-            radius[calc] = (sigma[calc, ia] - fraction * maximum[calc]) / \
-                           (sigma[calc, ia] - sigma[calc, ia + 1]) * \
-                           (self.apertures[ia + 1] - self.apertures[ia]) + \
-                self.apertures[ia]
-
-        calc = sigma[:, -1] > fraction * maximum
-        radius[calc] = self.apertures[-1]
-
-        return radius
+        if HAS_NUMBA:
+            radius = np.zeros(self.n_models)
+            # The fluxes are only copied if they are not already contiguous
+            # and in native byte order - Numba compiles a separate version of
+            # the kernel for each type of flux array.
+            radius_sigma_kernel(_as_native(self._flux_value),
+                                np.ascontiguousarray(self.apertures.to(u.au).value, dtype=float),
+                                float(fraction), radius)
+            return radius * u.au
+
+        flux = self._flux_value
+        apertures = self.apertures.to(u.au).value
+
+        # The surface brightness is computed one aperture at a time rather
+        # than for all apertures at once, to avoid having to store an array
+        # the same size as the fluxes.
+
+        maximum = _surface_brightness(flux, apertures, 0)
+        for ia in range(1, len(apertures)):
+            np.maximum(maximum, _surface_brightness(flux, apertures, ia), out=maximum)
+
+        threshold = fraction * maximum
+
+        radius = np.zeros(self.n_models, dtype=flux.dtype)
+
+        sigma_next = _surface_brightness(flux, apertures, len(apertures) - 1)
+        outermost = sigma_next > threshold
+
+        # Linear interpolation - need to loop over apertures backwards for
+        # vectorization. The interpolation is done for all models and then
+        # only kept where needed, which avoids indexing with boolean masks.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for ia in range(len(apertures) - 2, -1, -1):
+                sigma = _surface_brightness(flux, apertures, ia)
+                calc = (sigma > threshold) & (radius == 0.)
+                estimate = (sigma - threshold) / (sigma - sigma_next) * \
+                           (apertures[ia + 1] - apertures[ia]) + apertures[ia]
+                radius = np.where(calc, estimate, radius)
+                sigma_next = sigma
+
+        radius = np.where(outermost, apertures[-1], radius)
+
+        return radius * u.au
 
 
 class MonochromaticFluxes(ConvolvedFluxes):
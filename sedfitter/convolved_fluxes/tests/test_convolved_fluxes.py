@@ -281,3 +281,303 @@ def test_multiple_interpolate():
 
     assert_allclose_quantity(c2.error[:, 0], np.array([0.15, 0.4]) * u.mJy)
     assert_allclose_quantity(c2.error[:, 1], np.array([0.3, 0.2]) * u.mJy)
+
+
+def test_multiple_interpolate_edges():
+
+    c1 = ConvolvedFluxes()
+    c1.model_names = ['a', 'b']
+    c1.apertures = [1., 2., 3.] * u.au
+    c1.flux = [[1., 2., 3.], [4., 5., 6.]] * u.mJy
+    c1.error = [[0.1, 0.2, 0.4], [0.5, 0.3, 0.1]] * u.mJy
+
+    apertures = [1., 3., 5.] * u.au
+
+    c2 = c1.interpolate(apertures)
+
+    assert_allclose_quantity(c2.flux[:, 0], np.array([1., 4.]) * u.mJy)
+    assert_allclose_quantity(c2.flux[:, 1], np.array([3., 6.]) * u.mJy)
+    assert_allclose_quantity(c2.flux[:, 2], np.array([3., 6.]) * u.mJy)
+
+    # The requested apertures are reset to the maximum
+    assert_allclose_quantity(apertures, [1., 3., 3.] * u.au)
+    assert_allclose_quantity(c2.apertures, [1., 3., 3.] * u.au)
+
+    c3 = c1.interpolate([2.5e-5, 5e-5] * u.pc)
+
+    assert_allclose_quantity(c3.flux[:, 1], np.array([3., 6.]) * u.mJy)
+
+    with pytest.raises(Exception) as exc:
+        c1.interpolate([0.5, 1.5] * u.au)
+    assert exc.value.args[0] == "Aperture(s) requested too small"
+
+
+@pytest.mark.parametrize('block_size', [2, 4096])
+def test_find_radius_cumul(monkeypatch, block_size):
+
+    from .. import convolved_fluxes
+
+    monkeypatch.setattr(convolved_fluxes, '_RADIUS_BLOCK', block_size)
+
+    c = ConvolvedFluxes()
+    c.model_names = ['a', 'b', 'c']
+    c.apertures = [1., 2., 3., 4.] * u.au
+    c.flux = [[1., 2., 3., 4.], [0., 0., 0., 0.], [3., 3.5, 3.8, 4.]] * u.mJy
+    c.error = np.zeros((3, 4)) * u.mJy
+
+    assert_allclose_quantity(c.find_radius_cumul(0.5), [2., 4., 1.] * u.au)
+    assert_allclose_quantity(c.find_radius_cumul(0.9), [3.6, 4., 7. / 3.] * u.au)
+
+
+@pytest.mark.parametrize('use_numba', [False, True])
+def test_find_radius_sigma(monkeypatch, use_numba):
+
+    from .. import convolved_fluxes
+
+    if use_numba and not convolved_fluxes.HAS_NUMBA:
+        pytest.skip("numba is not installed")
+
+    monkeypatch.setattr(convolved_fluxes, 'HAS_NUMBA', use_numba)
+
+    c = ConvolvedFluxes()
+    c.model_names = ['a', 'b']
+    c.apertures = [1., 2., 3., 4.] * u.au
+    c.flux = [[1., 4., 9., 16.], [4., 5., 5., 5.]] * u.mJy
+    c.error = np.zeros((2, 4)) * u.mJy
+
+    assert_allclose_quantity(c.find_radius_sigma(0.5), [4., 17. / 11.] * u.au)
+
+    c.flux = c.flux.astype(np.float32)
+    assert_allclose_quantity(c.find_radius_sigma(0.5), [4., 17. / 11.] * u.au)
+
+    # Apertures beyond the maximum are clipped when interpolating, giving a
+    # repeated aperture and therefore a NaN surface brightness, which should
+    # propagate to the peak as with np.max.
+    c = ConvolvedFluxes()
+    c.model_names = ['a', 'b']
+    c.apertures = [1., 2., 3.] * u.au
+    c.flux = [[1., 4., 9.], [4., 5., 5.]] * u.mJy
+    c.error = np.zeros((2, 3)) * u.mJy
+
+    c = c.interpolate([1.5, 3., 10.] * u.au)
+
+    assert_allclose_quantity(c.find_radius_sigma(0.5), [0., 0.] * u.au)
+
+
+def test_multiple_inplace():
+
+    c = ConvolvedFluxes(model_names=['a', 'b', 'c'], apertures=[1., 2.] * u.au,
+                        initialize_arrays=True)
+
+    c.flux[1, :] = [1., 2.] * u.Jy
+    c.error[2] = [0.1, 0.2] * u.mJy
+
+    assert_allclose_quantity(c.flux, [[0., 0.], [1000., 2000.], [0., 0.]] * u.mJy)
+    assert_allclose_quantity(c.error, [[0., 0.], [0., 0.], [0.1, 0.2]] * u.mJy)
+
+
+@pytest.mark.parametrize('use_fitsio', [False, True])
+def test_roundtrip_backends(tmpdir, monkeypatch, use_fitsio):
+
+    from .. import convolved_fluxes
+
+    if use_fitsio and convolved_fluxes.fitsio is None:
+        pytest.skip("fitsio is not installed")
+
+    if not use_fitsio:
+        monkeypatch.setattr(convolved_fluxes, 'fitsio', None)
+
+    c1 = ConvolvedFluxes()
+    c1.central_wavelength = 3.6 * u.micron
+    c1.model_names = ['a', 'b', 'c']
+    c1.apertures = [1., 2.] * u.au
+    c1.flux = [[1., 2.], [3., 4.], [5., 6.]] * u.Jy
+    c1.error = [[0.1, 0.2], [0.1, 0.2], [0.1, 0.2]] * u.mJy
+
+    filename = str(tmpdir.join('test_backends.fits'))
+
+    c1.write(filename)
+    c2 = ConvolvedFluxes.read(filename)
+
+    assert c2.flux.unit == u.Jy
+    assert c2.error.unit == u.mJy
+
+    for array in (c2.apertures, c2.flux, c2.error):
+        assert array.dtype.isnative
+        assert array.flags['C_CONTIGUOUS']
+
+    assert c1 == c2
+
+
+def test_multiple_write_radii(tmpdir):
+
+    from astropy.io import fits
+
+    c1 = ConvolvedFluxes()
+    c1.model_names = ['a', 'b']
+    c1.apertures = [1., 2., 3., 4.] * u.au
+    c1.flux = [[1., 4., 9., 16.], [4., 5., 5., 5.]] * u.mJy
+    c1.error = np.zeros((2, 4)) * u.mJy
+
+    filename1 = str(tmpdir.join('test_no_radii.fits'))
+    c1.write(filename1)
+    assert 'RADIUS_SIGMA_50' not in fits.getdata(filename1, 1).names
+
+    filename2 = str(tmpdir.join('test_radii.fits'))
+    c1.write(filename2, compute_radii=True)
+    data = fits.getdata(filename2, 1)
+    np.testing.assert_allclose(data['RADIUS_SIGMA_50'], c1.find_radius_sigma(0.50).to(u.au).value)
+    np.testing.assert_allclose(data['RADIUS_CUMUL_99'], c1.find_radius_cumul(0.99).to(u.au).value)
+
+    c2 = ConvolvedFluxes.read(filename2)
+
+    assert c1 == c2
+
+
+def test_read_dtype(tmpdir):
+
+    c1 = ConvolvedFluxes()
+    c1.model_names = ['a', 'b']
+    c1.apertures = [1., 2., 3.] * u.au
+    c1.flux = [[1., 2., 3.], [4., 5., 6.]] * u.mJy
+    c1.error = [[0.1, 0.2, 0.4], [0.5, 0.3, 0.1]] * u.mJy
+
+    filename = str(tmpdir.join('test_dtype.fits'))
+
+    c1.write(filename)
+    c2 = ConvolvedFluxes.read(filename, dtype=np.float32)
+
+    assert c2.flux.dtype == np.float32
+    assert c2.error.dtype == np.float32
+
+    c3 = c2.interpolate([1.5, 2.5] * u.au)
+
+    assert c3.flux.dtype == np.float32
+
+    assert_allclose_quantity(c3.flux[:, 0], np.array([1.5, 4.5]) * u.mJy)
+    assert_allclose_quantity(c3.flux[:, 1], np.array([2.5, 5.5]) * u.mJy)
+
+    # By default, fluxes stored in single precision are interpolated in
+    # double precision
+
+    c1.flux = c1.flux.astype(np.float32)
+
+    c1.write(filename, overwrite=True)
+    c4 = ConvolvedFluxes.read(filename)
+
+    assert c4.flux.dtype == np.float32
+    assert c4.interpolate([1.5, 2.5] * u.au).flux.dtype == np.float64
+
+
+def test_equality(monkeypatch):
+
+    c1 = ConvolvedFluxes()
+    c1.model_names = ['a', 'b', 'c']
+    c1.apertures = [1., 2.] * u.au
+    c1.flux = [[1., 2.], [3., 4.], [5., 6.]] * u.mJy
+    c1.error = [[0.1, 0.2], [0.1, 0.2], [0.1, 0.2]] * u.mJy
+
+    assert c1 == c1
+
+    c2 = ConvolvedFluxes()
+    c2.model_names = c1.model_names
+    c2.apertures = c1.apertures
+    c2.flux = c1.flux
+    c2.error = c1.error
+
+    # Fluxes and errors that share the same arrays should not need to be
+    # compared element-wise, so the Quantity properties should not be used
+    def no_access(self):
+        raise AssertionError("fluxes were compared element-wise")
+
+    with monkeypatch.context() as m:
+        m.setattr(ConvolvedFluxes, 'flux', property(no_access))
+        m.setattr(ConvolvedFluxes, 'error', property(no_access))
+        assert c1 == c2
+
+    c2 = ConvolvedFluxes()
+    c2.model_names = ['a', 'b', 'c']
+    c2.apertures = [1., 2.] * u.au
+    c2.flux = [[0.001, 0.002], [0.003, 0.004], [0.005, 0.006]] * u.Jy
+    c2.error = [[0.1, 0.2], [0.1, 0.2], [0.1, 0.2]] * u.mJy
+
+    assert c1 == c2
+
+    c2.error = [[0.1, 0.2], [0.1, 0.2], [0.1, 0.3]] * u.mJy
+
+    assert not c1 == c2
+
+    c3 = ConvolvedFluxes()
+    c3.model_names = ['a', 'b', 'c']
+    c3.apertures = [1., 2., 3.] * u.au
+
+    assert not c1 == c3
+
+    c4 = ConvolvedFluxes()
+    c4.model_names = ['a', 'b', 'c']
+    c4.apertures = [1., 2.] * u.au
+
+    assert not c1 == c4
+
+
+def test_find_radius_cache():
+
+    c = ConvolvedFluxes()
+    c.model_names = ['a', 'b']
+    c.apertures = [1., 2., 3., 4.] * u.au
+    c.flux = [[1., 4., 9., 16.], [4., 5., 5., 5.]] * u.mJy
+    c.error = np.zeros((2, 4)) * u.mJy
+
+    r1 = c.find_radius_sigma(0.5)
+    r1[:] = 0. * u.au
+    assert_allclose_quantity(c.find_radius_sigma(0.5), [4., 17. / 11.] * u.au)
+
+    c.flux = [[4., 5., 5., 5.], [1., 4., 9., 16.]] * u.mJy
+    assert_allclose_quantity(c.find_radius_sigma(0.5), [17. / 11., 4.] * u.au)
+    assert_allclose_quantity(c.find_radius_cumul(0.5), [1., 2.8] * u.au)
+
+    c.apertures = [2., 4., 6., 8.] * u.au
+    assert_allclose_quantity(c.find_radius_cumul(0.5), [2., 5.6] * u.au)
+
+
+def test_find_radius_cumul_non_monotonic():
+
+    c = ConvolvedFluxes()
+    c.model_names = ['a', 'b', 'c']
+    c.apertures = [1., 2., 3., 4.] * u.au
+    c.flux = [[np.nan, 4., 9., 16.], [1., 4., np.nan, 16.], [1., 3., 2., 4.]] * u.mJy
+    c.error = np.zeros((3, 4)) * u.mJy
+
+    # Rows with NaN values only use valid intervals, and the outermost
+    # interval is used for non-monotonic fluxes
+    assert_allclose_quantity(c.find_radius_cumul(0.5), [2.8, 0., 3.] * u.au)
+    assert_allclose_quantity(c.find_radius_cumul(0.625), [3. + 1. / 7., 0., 3.25] * u.au)
+
+
+@pytest.mark.parametrize('fraction', [0., 0.5, 1.])
+def test_find_radius_sigma_zero_area(monkeypatch, fraction):
+
+    # Repeated apertures give annuli with zero area, and therefore infinite
+    # or NaN surface brightnesses - the Numpy and Numba versions should agree
+    # on the radii in this case.
+
+    from .. import convolved_fluxes
+
+    if not convolved_fluxes.HAS_NUMBA:
+        pytest.skip("numba is not installed")
+
+    radii = []
+
+    for use_numba in (False, True):
+
+        monkeypatch.setattr(convolved_fluxes, 'HAS_NUMBA', use_numba)
+
+        c = ConvolvedFluxes()
+        c.model_names = ['a', 'b', 'c']
+        c.apertures = [1., 2., 2., 3.] * u.au
+        c.flux = [[1., 4., 4., 9.], [1., 4., 5., 9.], [4., 5., 5., 5.]] * u.mJy
+        c.error = np.zeros((3, 4)) * u.mJy
+
+        radii.append(c.find_radius_sigma(fraction).to(u.au).value)
+
+    np.testing.assert_array_equal(radii[0], radii[1])
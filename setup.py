@@ -27,5 +27,7 @@ setup(name='sedfitter',
                     'sedfitter.utils.tests':['data/*.conf', 'data/*.par']},
       provides=['sedfitter'],
       install_requires=['numpy', 'scipy', 'matplotlib', 'astropy'],
+      extras_require={'numba': ['numba'],
+                      'fast_io': ['fitsio']},
       keywords=['Scientific/Engineering'],
      )